@@ -1,5 +1,6 @@
 import config_Version2 as config
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import yuvan_config_Version2 as yuvan_config
 
@@ -9,6 +10,14 @@ class AIAdvisoryAgent:
         self.model = config.GROQ_MODEL
         self.base_url = "https://api.groq.com/openai/v1/chat/completions"
         
+        # Reuse one pooled connection to Groq instead of a new TCP+TLS handshake per request
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        })
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+        
         # Load configuration from yuvan_config
         self.character_config = yuvan_config.get_character_config()
         self.capabilities = yuvan_config.get_capabilities()
@@ -18,22 +27,17 @@ class AIAdvisoryAgent:
         
         # Get the comprehensive system prompt
         self.system_prompt = yuvan_config.get_system_prompt()
+        
+        # Build the full system message once so every request shares an
+        # identical prefix (keeps provider-side prompt caching effective)
+        self.enhanced_system_prompt = self.system_prompt + "\n\n" + self._get_tools_context()
 
     def get_response(self, prompt):
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            # Add tool information to the context
-            tools_context = self._get_tools_context()
-            enhanced_system_prompt = self.system_prompt + "\n\n" + tools_context
-            
             data = {
                 "model": self.model,
                 "messages": [
-                    {"role": "system", "content": enhanced_system_prompt},
+                    {"role": "system", "content": self.enhanced_system_prompt},
                     {"role": "user", "content": prompt}
                 ],
                 "temperature": 0.7,
@@ -41,9 +45,8 @@ class AIAdvisoryAgent:
                 "stream": False
             }
             
-            response = requests.post(
+            response = self.session.post(
                 self.base_url,
-                headers=headers,
                 json=data,
                 timeout=30
             )
@@ -107,17 +110,15 @@ class AIAdvisoryAgent:
     def get_tool_suggestions(self, user_input):
         """Suggest relevant tools based on user input"""
         suggestions = []
-        user_input_lower = user_input.lower()
         
-        for tool_name, tool_config in self.tools_config.items():
-            for trigger in tool_config['triggers']:
-                if trigger.lower() in user_input_lower:
-                    suggestions.append({
-                        "tool": tool_name,
-                        "name": tool_config['name'],
-                        "description": tool_config['description'],
-                        "examples": tool_config['usage_examples']
-                    })
-                    break
+        # One scan of the input for every tool's triggers
+        for tool_name in yuvan_config.find_matching_tools(user_input):
+            tool_config = self.tools_config[tool_name]
+            suggestions.append({
+                "tool": tool_name,
+                "name": tool_config['name'],
+                "description": tool_config['description'],
+                "examples": tool_config['usage_examples']
+            })
         
         return suggestions
@@ -4,15 +4,74 @@ Real-time text-to-speech using Silero with asyncio support
 """
 
 import asyncio
+import contextlib
+import functools
 import torch
-import torchaudio
-import tempfile
 import os
 import threading
 import queue
+import pygame
 from typing import Optional, Callable
 import numpy as np
 
+# Serialises model loads so concurrent instances share one copy
+_load_lock = threading.Lock()
+
+def _optimize_silero(model):
+    """
+    Compile or freeze Silero's inner network to cut per-call dispatch overhead
+    
+    Returns:
+        The original eager module, or None if the model has no inner network
+    """
+    inner = getattr(model, "model", None)
+    if not isinstance(inner, torch.nn.Module):
+        return None
+    inner = inner.eval()
+    try:
+        if isinstance(inner, torch.jit.ScriptModule):
+            model.model = torch.jit.optimize_for_inference(torch.jit.freeze(inner))
+        elif hasattr(torch, "compile"):
+            # Utterance length varies, so compile for dynamic shapes
+            model.model = torch.compile(inner, mode="reduce-overhead", dynamic=True)
+        else:
+            scripted = torch.jit.script(inner)
+            model.model = torch.jit.optimize_for_inference(torch.jit.freeze(scripted))
+    except Exception as e:
+        # Some Silero releases cannot be compiled; eager mode still works
+        print(f"Warning: Silero TTS optimisation skipped: {e}")
+        model.model = inner
+    return inner
+
+def _warm_up(model, eager, speaker: str, sample_rate: int):
+    """Run throwaway syntheses so JIT/compile cost is paid before the first request"""
+    # torch.compile traces again once it sees a second input shape
+    runs = 2 if eager is not None and model.model is not eager else 1
+    try:
+        with torch.inference_mode():
+            for _ in range(runs):
+                model.apply_tts(text="warm up", speaker=speaker, sample_rate=sample_rate)
+    except Exception as e:
+        if eager is None:
+            raise
+        print(f"Warning: optimised Silero model failed warm-up, using eager mode: {e}")
+        model.model = eager
+
+@functools.lru_cache(maxsize=4)
+def _load_silero(language: str, speaker: str, device: str, sample_rate: int):
+    """Load, optimise and warm up a Silero model once per voice and device"""
+    model, _ = torch.hub.load(
+        repo_or_dir='snakers4/silero-models',
+        model='silero_tts',
+        language=language,
+        speaker=speaker
+    )
+    model.to(device)
+    # The eager module is kept so a graph that fails on first use can be swapped back
+    eager = _optimize_silero(model)
+    _warm_up(model, eager, speaker, sample_rate)
+    return model
+
 class SileroTTS:
     def __init__(self, device: str = "cpu", language: str = "en", speaker: str = "en_0"):
         """
@@ -33,6 +92,15 @@ class SileroTTS:
         self.is_speaking = False
         self.stop_speaking = False
         
+        # Set from the init thread once loading finishes (successfully or not)
+        self._loop = asyncio.get_event_loop()
+        self._ready = asyncio.Event()
+        
+        try:
+            self._init_mixer()
+        except Exception as e:
+            print(f"Warning: Audio mixer not available yet: {e}")
+        
         # Initialize in a separate thread to avoid blocking
         self.init_thread = threading.Thread(target=self._initialize_model, daemon=True)
         self.init_thread.start()
@@ -40,29 +108,38 @@ class SileroTTS:
     def _initialize_model(self):
         """Initialize the Silero model (blocking)"""
         try:
-            # Load Silero TTS model
-            self.model, _ = torch.hub.load(
-                repo_or_dir='snakers4/silero-models',
-                model='silero_tts',
-                language=self.language,
-                speaker=self.speaker
-            )
-            self.model.to(self.device)
+            # Use the physical cores for intra-op parallelism on CPU inference
+            if self.device == "cpu":
+                torch.set_num_threads(max(1, (os.cpu_count() or 2) // 2))
+            
+            # Load Silero TTS model (shared with other instances using the same voice)
+            with _load_lock:
+                self.model = _load_silero(
+                    self.language, self.speaker, self.device, self.sample_rate
+                )
             self.is_initialized = True
             print(f"✅ Silero TTS initialized successfully! (Language: {self.language}, Speaker: {self.speaker})")
         except Exception as e:
             print(f"❌ Failed to initialize Silero TTS: {e}")
             self.is_initialized = False
+        finally:
+            try:
+                self._loop.call_soon_threadsafe(self._ready.set)
+            except RuntimeError:
+                pass  # Event loop already closed; nobody is waiting
     
     async def wait_for_initialization(self, timeout: float = 30.0):
         """Wait for model initialization to complete"""
-        start_time = asyncio.get_event_loop().time()
-        while not self.is_initialized:
-            if asyncio.get_event_loop().time() - start_time > timeout:
-                raise TimeoutError("Silero TTS initialization timed out")
-            await asyncio.sleep(0.1)
+        if self.is_initialized:
+            return
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError("Silero TTS initialization timed out")
+        if not self.is_initialized:
+            raise RuntimeError("Silero TTS failed to initialize")
     
-    async def synthesize_speech(self, text: str) -> Optional[str]:
+    async def synthesize_speech(self, text: str) -> Optional[np.ndarray]:
         """
         Synthesize speech from text asynchronously
         
@@ -70,7 +147,7 @@ class SileroTTS:
             text: Text to synthesize
             
         Returns:
-            Path to generated audio file or None if failed
+            Float32 mono samples at self.sample_rate or None if failed
         """
         if not text or not text.strip():
             return None
@@ -82,47 +159,38 @@ class SileroTTS:
         try:
             # Run synthesis in thread pool to avoid blocking
             loop = asyncio.get_event_loop()
-            audio_path = await loop.run_in_executor(
+            audio = await loop.run_in_executor(
                 None, self._synthesize_speech_sync, text
             )
-            return audio_path
+            return audio
         except Exception as e:
             print(f"Error in speech synthesis: {e}")
             return None
     
-    def _synthesize_speech_sync(self, text: str) -> Optional[str]:
+    def _synthesize_speech_sync(self, text: str) -> Optional[np.ndarray]:
         """Synchronous speech synthesis (runs in thread pool)"""
         try:
-            # Generate audio
-            audio = self.model.apply_tts(
-                text=text,
-                speaker=self.speaker,
-                sample_rate=self.sample_rate
-            )
-            
-            # Convert to numpy array
-            audio_np = audio.numpy()
+            # Generate audio (inference only, so skip autograd bookkeeping)
+            with torch.inference_mode(), self._autocast():
+                audio = self.model.apply_tts(
+                    text=text,
+                    speaker=self.speaker,
+                    sample_rate=self.sample_rate
+                )
             
-            # Create temporary file
-            temp_file = tempfile.NamedTemporaryFile(
-                suffix='.wav', 
-                delete=False,
-                dir=tempfile.gettempdir()
-            )
-            
-            # Save audio
-            torchaudio.save(
-                temp_file.name,
-                torch.tensor(audio_np).unsqueeze(0),
-                self.sample_rate
-            )
-            
-            return temp_file.name
+            # Keep the samples in memory; no WAV encode/decode round-trip
+            return audio.detach().float().cpu().numpy()
             
         except Exception as e:
             print(f"Error in synchronous speech synthesis: {e}")
             return None
     
+    def _autocast(self):
+        """Half-precision autocast on CUDA; full precision elsewhere"""
+        if self.device.startswith("cuda"):
+            return torch.autocast(device_type="cuda", dtype=torch.float16)
+        return contextlib.nullcontext()
+    
     async def speak_text(self, text: str, callback: Optional[Callable] = None):
         """
         Speak text asynchronously
@@ -137,70 +205,107 @@ class SileroTTS:
         # Add to audio queue
         await self.audio_queue.put((text, callback))
         
-        # Start audio processing if not already running
+        # Start audio processing if not already running. The flag is set here,
+        # not in the task, so back-to-back calls cannot start two processors.
         if not self.is_speaking:
+            self.is_speaking = True
             asyncio.create_task(self._process_audio_queue())
     
     async def _process_audio_queue(self):
-        """Process audio queue asynchronously"""
+        """Synthesize queued text while the previous utterance is still playing"""
         self.is_speaking = True
+        # Bounded so synthesis runs at most a couple of utterances ahead
+        playback_queue = asyncio.Queue(maxsize=2)
+        player = asyncio.create_task(self._playback_worker(playback_queue))
         
         try:
             while not self.audio_queue.empty() and not self.stop_speaking:
                 text, callback = await self.audio_queue.get()
                 
-                if self.stop_speaking:
-                    break
-                
-                # Synthesize speech
-                audio_path = await self.synthesize_speech(text)
-                
-                if audio_path and os.path.exists(audio_path):
-                    # Play audio asynchronously
-                    await self._play_audio_async(audio_path)
+                try:
+                    if self.stop_speaking:
+                        break
                     
-                    # Clean up
-                    try:
-                        os.remove(audio_path)
-                    except:
-                        pass
+                    # Synthesize speech
+                    audio = await self.synthesize_speech(text)
                     
-                    # Call callback if provided
-                    if callback:
-                        try:
-                            callback()
-                        except:
-                            pass
-                else:
-                    print(f"Failed to synthesize speech for: {text[:50]}...")
-                
-                # Mark task as done
-                self.audio_queue.task_done()
+                    if audio is not None and audio.size:
+                        await playback_queue.put((audio, callback))
+                    else:
+                        print(f"Failed to synthesize speech for: {text[:50]}...")
+                finally:
+                    # Mark task as done
+                    self.audio_queue.task_done()
                 
         except Exception as e:
             print(f"Error in audio queue processing: {e}")
         finally:
+            await playback_queue.put(None)
+            await player
             self.is_speaking = False
+            # Pick up text that was queued while the last utterance was playing
+            if not self.audio_queue.empty() and not self.stop_speaking:
+                self.is_speaking = True
+                asyncio.create_task(self._process_audio_queue())
+    
+    async def _playback_worker(self, playback_queue: asyncio.Queue):
+        """Play synthesized utterances in order until the producer signals the end"""
+        while True:
+            item = await playback_queue.get()
+            if item is None:
+                return
+            if self.stop_speaking:
+                continue
+            
+            audio, callback = item
+            await self._play_audio_async(audio)
+            
+            # Call callback if provided
+            if callback:
+                try:
+                    callback()
+                except:
+                    pass
     
-    async def _play_audio_async(self, audio_path: str):
-        """Play audio file asynchronously"""
+    async def _play_audio_async(self, audio: np.ndarray):
+        """Play synthesized samples asynchronously"""
         try:
             # Use pygame for audio playback in a separate thread
             loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, self._play_audio_sync, audio_path)
+            await loop.run_in_executor(None, self._play_audio_sync, audio)
         except Exception as e:
             print(f"Error playing audio: {e}")
     
-    def _play_audio_sync(self, audio_path: str):
+    def _init_mixer(self):
+        """Open the pygame mixer once; every utterance reuses it"""
+        if not pygame.mixer.get_init():
+            pygame.mixer.init(frequency=self.sample_rate, size=-16, channels=1, buffer=512)
+        return pygame.mixer.get_init()
+    
+    def _to_mixer_pcm(self, audio: np.ndarray, frequency: int, channels: int) -> np.ndarray:
+        """Convert float samples to 16-bit PCM in the mixer's rate and channel layout"""
+        if frequency != self.sample_rate:
+            # The mixer may already be open at another rate (e.g. by YuvanVoice)
+            target_len = int(len(audio) * frequency / self.sample_rate)
+            audio = np.interp(
+                np.linspace(0, len(audio) - 1, target_len),
+                np.arange(len(audio)),
+                audio
+            )
+        pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+        if channels > 1:
+            pcm = np.repeat(pcm[:, np.newaxis], channels, axis=1)
+        return np.ascontiguousarray(pcm)
+    
+    def _play_audio_sync(self, audio: np.ndarray):
         """Synchronous audio playback (runs in thread pool)"""
         try:
-            import pygame
-            pygame.mixer.init(frequency=24000, size=-16, channels=1, buffer=512)
-            pygame.mixer.music.load(audio_path)
-            pygame.mixer.music.play()
+            frequency, _, channels = pygame.mixer.get_init() or self._init_mixer()
+            pcm = self._to_mixer_pcm(audio, frequency, channels)
+            channel = pygame.mixer.Sound(buffer=pcm.tobytes()).play()
             
             # Wait for audio to finish
-            while pygame.mixer.music.get_busy():
+            while channel is not None and channel.get_busy():
                 pygame.time.wait(100)
                 
         except Exception as e:
@@ -258,4 +363,6 @@ def cleanup_silero_tts():
     global silero_tts
     if silero_tts:
         silero_tts.cleanup()
-        silero_tts = None 
\ No newline at end of file
+        silero_tts = None
+    # Release the shared models as well
+    _load_silero.cache_clear() 
\ No newline at end of file
@@ -1,17 +1,119 @@
 import json
 import re
 import datetime
-import psutil
+import functools
 import os
-import requests
 import math
 import random
-from typing import Dict, Any, Optional, List
+import threading
+import time
+from urllib.parse import quote_plus
+from typing import Dict, Any, Optional, List, Tuple
 from abc import ABC, abstractmethod
-from yuvan.ai_advisory_agent import AIAdvisoryAgent
 import config_Version2 as config
 import yuvan_config_Version2 as yuvan_config
 
+# orjson parses the larger SerpAPI payloads noticeably faster; it is optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Shared by the SerpAPI tools so back-to-back queries reuse one TLS connection.
+# Created on first use so importing this module does not pull in requests.
+_serp_session = None
+_serp_lock = threading.Lock()
+
+def _get_serp_session():
+    """Return the pooled SerpAPI session, creating it on first use"""
+    global _serp_session
+    with _serp_lock:
+        if _serp_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(
+                pool_connections=10,
+                pool_maxsize=10,
+                max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504])
+            ))
+            _serp_session = session
+        return _serp_session
+
+# Query strings are prebuilt per engine; only the quoted query is appended per call.
+# The API key is sent as a separate parameter so it is never part of these strings.
+_SERPAPI_SEARCH_URL = "https://serpapi.com/search"
+_SERPAPI_AUTH = {"api_key": config.SERPAPI_API_KEY}
+_WEATHER_URL = _SERPAPI_SEARCH_URL + "?engine=google&q=weather+"
+_GOOGLE_SEARCH_URL = _SERPAPI_SEARCH_URL + "?engine=google&num=3&q="  # Get top 3 results
+_MAPS_URL = _SERPAPI_SEARCH_URL + "?engine=google_maps&q="
+
+def _fetch_serp(url: str) -> Any:
+    """GET a SerpAPI URL and decode the JSON body, using orjson when installed"""
+    response = _get_serp_session().get(url, params=_SERPAPI_AUTH, timeout=5)
+    response.raise_for_status()
+    # SerpAPI always sends UTF-8, so parse the raw bytes and skip charset detection
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return json.loads(response.content)
+
+def _serp_error_message(error: Exception) -> str:
+    """Describe a failed SerpAPI call without echoing the request URL, which carries the API key"""
+    response = getattr(error, "response", None)
+    if response is not None:
+        return f"the search service returned HTTP {response.status_code}."
+    if not isinstance(error, OSError):
+        return "the search service sent a response that could not be read."
+    return "the search service could not be reached."
+
+class TTLCache:
+    """Small thread-safe cache whose entries expire after a fixed time"""
+    
+    def __init__(self, ttl: float, maxsize: int = 256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: Dict[str, Tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, stored_at = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._data[key]
+                return None
+            return value
+    
+    def set(self, key: str, value: Any):
+        """Store a value, evicting the oldest entry when full"""
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.maxsize:
+                del self._data[next(iter(self._data))]
+            self._data[key] = (value, time.monotonic())
+    
+    def clear(self):
+        """Drop all cached entries"""
+        with self._lock:
+            self._data.clear()
+
+# SerpAPI answers keyed by the lowered query; weather goes stale fastest
+_WEATHER_CACHE = TTLCache(ttl=300)
+_SEARCH_CACHE = TTLCache(ttl=600, maxsize=1024)
+_MAPS_CACHE = TTLCache(ttl=900, maxsize=512)
+
+def _first_capture(patterns: List[re.Pattern], command: str) -> Optional[str]:
+    """Return the stripped first group of the first pattern that captures one"""
+    for pattern in patterns:
+        match = pattern.search(command)
+        if match and match.groups():
+            return match.group(1).strip()
+    return None
+
 class Tool(ABC):
     """Base class for all tools"""
     
@@ -34,6 +136,15 @@ class Tool(ABC):
     def execute(self, command: str) -> str:
         """Execute the tool with the given command"""
         pass
+    
+    def get_compiled_patterns(self) -> List[re.Pattern]:
+        """Return this tool's patterns, compiled once per instance"""
+        # Per instance, since get_patterns() may depend on how the tool was built
+        compiled = getattr(self, "_compiled_patterns", None)
+        if compiled is None:
+            compiled = [re.compile(pattern, re.IGNORECASE) for pattern in self.get_patterns()]
+            self._compiled_patterns = compiled
+        return compiled
 
 class WeatherTool(Tool):
     """Tool for getting weather information using SerpAPI"""
@@ -59,43 +170,37 @@ class WeatherTool(Tool):
             if command.lower().strip() == "weather":
                 return "Please specify a location for weather information. For example: 'weather in London' or 'weather in New York'"
             
-            # Extract location from command
-            location = None
-            for pattern in self.get_patterns():
-                match = re.search(pattern, command, re.IGNORECASE)
-                if match:
-                    # Skip the first pattern (just "weather") since we already handled it
-                    if pattern == r"^weather$":
-                        continue
-                    location = match.group(1).strip()
-                    break
+            # Extract location from command; the bare "weather" pattern captures nothing
+            location = _first_capture(self.get_compiled_patterns(), command)
             
             if not location:
                 return "Please specify a location for weather information."
             
-            # Use SerpAPI to get weather
-            url = "https://serpapi.com/search"
-            params = {
-                "q": f"weather {location}",
-                "api_key": config.SERPAPI_API_KEY,
-                "engine": "google"
-            }
+            cache_key = location.lower()
+            cached = _WEATHER_CACHE.get(cache_key)
+            if cached is not None:
+                return cached
             
-            response = requests.get(url, params=params, timeout=5)  # Added timeout
-            data = response.json()
+            # Use SerpAPI to get weather
+            data = _fetch_serp(_WEATHER_URL + quote_plus(location))
             
             if "answer_box" in data and "weather" in data["answer_box"]:
                 weather_data = data["answer_box"]["weather"]
-                return f"Weather in {location}: {weather_data}"
+                answer = f"Weather in {location}: {weather_data}"
             elif "organic_results" in data and data["organic_results"]:
                 # Fallback to first result
                 result = data["organic_results"][0]
-                return f"Weather information for {location}: {result.get('snippet', 'Information not available')}"
+                answer = f"Weather information for {location}: {result.get('snippet', 'Information not available')}"
             else:
                 return f"Sorry, I couldn't find weather information for {location}."
+            
+            _WEATHER_CACHE.set(cache_key, answer)
+            return answer
                 
-        except Exception as e:
-            return f"Error getting weather information: {str(e)}"
+        except (OSError, ValueError) as e:
+            # requests' errors are OSErrors; bad JSON raises ValueError.
+            # str(e) can include the request URL, so it is never shown.
+            return f"Error getting weather information: {_serp_error_message(e)}"
 
 class GoogleSearchTool(Tool):
     """Tool for Google searches using SerpAPI"""
@@ -119,44 +224,40 @@ class GoogleSearchTool(Tool):
     def execute(self, command: str) -> str:
         try:
             # Extract search query
-            query = None
-            for pattern in self.get_patterns():
-                match = re.search(pattern, command, re.IGNORECASE)
-                if match:
-                    query = match.group(1).strip()
-                    break
+            query = _first_capture(self.get_compiled_patterns(), command)
             
             if not query:
                 return "Please specify what you'd like to search for."
             
-            # Use SerpAPI for Google search
-            url = "https://serpapi.com/search"
-            params = {
-                "q": query,
-                "api_key": config.SERPAPI_API_KEY,
-                "engine": "google",
-                "num": 3  # Get top 3 results
-            }
+            cache_key = query.lower()
+            cached = _SEARCH_CACHE.get(cache_key)
+            if cached is not None:
+                return cached
             
-            response = requests.get(url, params=params, timeout=5)  # Added timeout
-            data = response.json()
+            # Use SerpAPI for Google search
+            # Keep only what is shown so the full payload can be freed right away
+            results = _fetch_serp(_GOOGLE_SEARCH_URL + quote_plus(query)).get("organic_results")
             
-            if "organic_results" in data and data["organic_results"]:
-                results = data["organic_results"][:3]
-                response_text = f"Search results for '{query}':\n\n"
+            if results:
+                results = results[:3]
+                parts = [f"Search results for '{query}':\n\n"]
                 
                 for i, result in enumerate(results, 1):
                     title = result.get("title", "No title")
                     snippet = result.get("snippet", "No description")
                     link = result.get("link", "")
-                    response_text += f"{i}. {title}\n{snippet}\n{link}\n\n"
+                    parts.append(f"{i}. {title}\n{snippet}\n{link}\n\n")
                 
-                return response_text
+                answer = "".join(parts)
+                _SEARCH_CACHE.set(cache_key, answer)
+                return answer
             else:
                 return f"No search results found for '{query}'."
                 
-        except Exception as e:
-            return f"Error performing search: {str(e)}"
+        except (OSError, ValueError) as e:
+            # requests' errors are OSErrors; bad JSON raises ValueError.
+            # str(e) can include the request URL, so it is never shown.
+            return f"Error performing search: {_serp_error_message(e)}"
 
 class MapsTool(Tool):
     """Tool for Google Maps functionality using SerpAPI"""
@@ -181,43 +282,65 @@ class MapsTool(Tool):
     def execute(self, command: str) -> str:
         try:
             # Extract location/query
-            query = None
-            for pattern in self.get_patterns():
-                match = re.search(pattern, command, re.IGNORECASE)
-                if match:
-                    query = match.group(1).strip()
-                    break
+            query = _first_capture(self.get_compiled_patterns(), command)
             
             if not query:
                 return "Please specify a location or what you're looking for."
             
-            # Use SerpAPI for maps search
-            url = "https://serpapi.com/search"
-            params = {
-                "q": query,
-                "api_key": config.SERPAPI_API_KEY,
-                "engine": "google_maps"
-            }
+            cache_key = query.lower()
+            cached = _MAPS_CACHE.get(cache_key)
+            if cached is not None:
+                return cached
             
-            response = requests.get(url, params=params, timeout=5)  # Added timeout
-            data = response.json()
+            # Use SerpAPI for maps search
+            # Keep only what is shown so the full payload can be freed right away
+            results = _fetch_serp(_MAPS_URL + quote_plus(query)).get("local_results")
             
-            if "local_results" in data and data["local_results"]:
-                results = data["local_results"][:5]
-                response_text = f"Results for '{query}':\n\n"
+            if results:
+                results = results[:5]
+                parts = [f"Results for '{query}':\n\n"]
                 
                 for i, result in enumerate(results, 1):
                     title = result.get("title", "No title")
                     address = result.get("address", "No address")
                     rating = result.get("rating", "No rating")
-                    response_text += f"{i}. {title}\nAddress: {address}\nRating: {rating}\n\n"
+                    parts.append(f"{i}. {title}\nAddress: {address}\nRating: {rating}\n\n")
                 
-                return response_text
+                answer = "".join(parts)
+                _MAPS_CACHE.set(cache_key, answer)
+                return answer
             else:
                 return f"No location results found for '{query}'."
                 
-        except Exception as e:
-            return f"Error getting location information: {str(e)}"
+        except (OSError, ValueError) as e:
+            # requests' errors are OSErrors; bad JSON raises ValueError.
+            # str(e) can include the request URL, so it is never shown.
+            return f"Error getting location information: {_serp_error_message(e)}"
+
+# Latest CPU reading from the background sampler (None until the first sample)
+_cpu_percent: Optional[float] = None
+_cpu_sampler_lock = threading.Lock()
+_cpu_sampler_thread: Optional[threading.Thread] = None
+
+def _sample_cpu():
+    """Refresh _cpu_percent once a second using psutil's non-blocking mode"""
+    global _cpu_percent
+    import psutil
+    psutil.cpu_percent(interval=None)  # First call only sets the baseline
+    while True:
+        time.sleep(1.0)
+        _cpu_percent = psutil.cpu_percent(interval=None)
+
+def _start_cpu_sampler():
+    """Start the CPU sampler thread if it is not already running"""
+    global _cpu_sampler_thread
+    with _cpu_sampler_lock:
+        if _cpu_sampler_thread is None:
+            _cpu_sampler_thread = threading.Thread(target=_sample_cpu, daemon=True)
+            _cpu_sampler_thread.start()
+
+# Memory and disk figures rarely need sub-second freshness
+_SYSTEM_STATS_CACHE = TTLCache(ttl=0.5, maxsize=1)
 
 class SystemInfoTool(Tool):
     """Tool for system information"""
@@ -244,19 +367,45 @@ class SystemInfoTool(Tool):
     
     def execute(self, command: str) -> str:
         try:
-            cpu_percent = psutil.cpu_percent(interval=0.1)  # Reduced interval for faster response
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
+            import psutil
+            
+            # Started on first use, so handlers that never ask for system info
+            # run no sampler thread
+            _start_cpu_sampler()
+            
+            cpu_percent = _cpu_percent
+            if cpu_percent is None:
+                # Sampler has not reported yet; take one short blocking reading
+                cpu_percent = psutil.cpu_percent(interval=0.1)
             
-            info = f"System Information:\n"
-            info += f"CPU Usage: {cpu_percent}%\n"
-            info += f"RAM Usage: {memory.percent}% ({memory.used // (1024**3)}GB / {memory.total // (1024**3)}GB)\n"
-            info += f"Disk Usage: {disk.percent}% ({disk.used // (1024**3)}GB / {disk.total // (1024**3)}GB)\n"
+            stats = _SYSTEM_STATS_CACHE.get("stats")
+            if stats is None:
+                stats = (psutil.virtual_memory(), psutil.disk_usage('/'))
+                _SYSTEM_STATS_CACHE.set("stats", stats)
+            memory, disk = stats
             
-            return info
+            return (
+                "System Information:\n"
+                f"CPU Usage: {cpu_percent}%\n"
+                f"RAM Usage: {memory.percent}% ({memory.used // (1024**3)}GB / {memory.total // (1024**3)}GB)\n"
+                f"Disk Usage: {disk.percent}% ({disk.used // (1024**3)}GB / {disk.total // (1024**3)}GB)\n"
+            )
         except Exception as e:
             return f"Error getting system information: {str(e)}"
 
+# Names an expression may use; built once rather than on every calculation
+_ALLOWED_MATH_NAMES = {
+    'abs': abs, 'round': round, 'min': min, 'max': max,
+    'sum': sum, 'pow': pow, 'sqrt': math.sqrt,
+    'sin': math.sin, 'cos': math.cos, 'tan': math.tan,
+    'pi': math.pi, 'e': math.e
+}
+
+@functools.lru_cache(maxsize=256)
+def _compile_math(expression: str):
+    """Compile a cleaned expression once; repeats reuse the code object"""
+    return compile(expression, "<math>", "eval")
+
 class MathTool(Tool):
     """Tool for mathematical calculations"""
     
@@ -269,45 +418,50 @@ class MathTool(Tool):
     def get_patterns(self) -> List[str]:
         return [
             r"calculate\s+(.+)",
-            r"what\s+is\s+(\d+[\+\-\*\/\^\(\)\d\s]+)",
-            r"(\d+[\+\-\*\/\^\(\)\d\s]+)\s*=\s*\?",
+            r"what\s+is\s+(\d[\+\-\*\/\^\(\)\d\s]+)",
+            # Only tried from the start of a run of expression characters, so a
+            # long expression without "=?" is scanned once instead of once per digit
+            r"(?<![\+\-\*\/\^\(\)\d\s])[\+\-\*\/\^\(\)\s]*(\d[\+\-\*\/\^\(\)\d\s]+)=\s*\?",
             r"math\s+(.+)"
         ]
     
     def execute(self, command: str) -> str:
         try:
             # Extract mathematical expression
-            expression = None
-            for pattern in self.get_patterns():
-                match = re.search(pattern, command, re.IGNORECASE)
-                if match:
-                    expression = match.group(1).strip()
-                    break
+            expression = _first_capture(self.get_compiled_patterns(), command)
             
             if not expression:
                 return "Please provide a mathematical expression to calculate."
             
             # Clean and evaluate the expression
             expression = re.sub(r'[^\d\+\-\*\/\^\(\)\.\s]', '', expression)
-            expression = expression.replace('^', '**')
+            # compile() rejects the leading whitespace eval() used to strip
+            expression = expression.replace('^', '**').strip()
             
             # Safe evaluation
-            allowed_names = {
-                'abs': abs, 'round': round, 'min': min, 'max': max,
-                'sum': sum, 'pow': pow, 'sqrt': math.sqrt,
-                'sin': math.sin, 'cos': math.cos, 'tan': math.tan,
-                'pi': math.pi, 'e': math.e
-            }
-            
-            result = eval(expression, {"__builtins__": {}}, allowed_names)
+            result = eval(_compile_math(expression), {"__builtins__": {}}, _ALLOWED_MATH_NAMES)
             return f"Result: {expression} = {result}"
             
         except Exception as e:
             return f"Error calculating: {str(e)}"
 
+_JOKES = (
+    "Why don't scientists trust atoms? Because they make up everything!",
+    "Why did the scarecrow win an award? Because he was outstanding in his field!",
+    "Why don't eggs tell jokes? They'd crack each other up!",
+    "What do you call a fake noodle? An impasta!",
+    "Why did the math book look so sad? Because it had too many problems!",
+    "What do you call a bear with no teeth? A gummy bear!",
+    "Why don't skeletons fight each other? They don't have the guts!",
+    "What do you call a fish wearing a bowtie? So-fish-ticated!"
+)
+
 class JokeTool(Tool):
     """Tool for telling jokes"""
     
+    # Own generator so jokes don't contend with other users of the global one
+    _rng = random.Random()
+    
     def get_name(self) -> str:
         return "joke"
     
@@ -323,17 +477,7 @@ class JokeTool(Tool):
         ]
     
     def execute(self, command: str) -> str:
-        jokes = [
-            "Why don't scientists trust atoms? Because they make up everything!",
-            "Why did the scarecrow win an award? Because he was outstanding in his field!",
-            "Why don't eggs tell jokes? They'd crack each other up!",
-            "What do you call a fake noodle? An impasta!",
-            "Why did the math book look so sad? Because it had too many problems!",
-            "What do you call a bear with no teeth? A gummy bear!",
-            "Why don't skeletons fight each other? They don't have the guts!",
-            "What do you call a fish wearing a bowtie? So-fish-ticated!"
-        ]
-        return random.choice(jokes)
+        return self._rng.choice(_JOKES)
 
 class FileTool(Tool):
     """Tool for file operations"""
@@ -355,12 +499,7 @@ class FileTool(Tool):
     def execute(self, command: str) -> str:
         try:
             # Extract directory/file path
-            path = None
-            for pattern in self.get_patterns():
-                match = re.search(pattern, command, re.IGNORECASE)
-                if match:
-                    path = match.group(1).strip()
-                    break
+            path = _first_capture(self.get_compiled_patterns(), command)
             
             if not path:
                 path = "."  # Current directory
@@ -368,17 +507,24 @@ class FileTool(Tool):
             if "read file" in command.lower():
                 # Read file content
                 try:
+                    # Only read what can be shown (plus one char to detect truncation)
                     with open(path, 'r', encoding='utf-8') as f:
-                        content = f.read()
+                        content = f.read(501)
                     return f"File content of {path}:\n\n{content[:500]}..." if len(content) > 500 else content
                 except Exception as e:
                     return f"Error reading file {path}: {str(e)}"
             else:
                 # List files in directory
                 try:
-                    files = os.listdir(path)
+                    # Stop after 20 entries rather than listing the whole directory
+                    files = []
+                    with os.scandir(path) as entries:
+                        for entry in entries:
+                            files.append(entry.name)
+                            if len(files) == 20:
+                                break
                     if files:
-                        file_list = "\n".join(files[:20])  # Limit to 20 files
+                        file_list = "\n".join(files)
                         return f"Files in {path}:\n{file_list}"
                     else:
                         return f"No files found in {path}"
@@ -415,66 +561,156 @@ class TimeTool(Tool):
         else:
             return f"The current time is {now.strftime('%I:%M:%S %p')} on {now.strftime('%A, %B %d, %Y')}"
 
+# Tools registered on every ToolRegistry, in dispatch priority order
+_DEFAULT_TOOLS = (
+    WeatherTool,
+    GoogleSearchTool,
+    MapsTool,
+    SystemInfoTool,
+    MathTool,
+    JokeTool,
+    FileTool,
+    TimeTool,
+)
+
+# Leading words that name their tool outright; checked before the full scan
+_VERB_TO_TOOL = {
+    "weather": "weather",
+    "temperature": "weather",
+    "search": "google_search",
+    "google": "google_search",
+    "directions": "maps",
+    "direction": "maps",
+    "nearby": "maps",
+    "calculate": "math",
+    "math": "math",
+    "joke": "joke",
+    "list": "file_operations",
+    "show": "file_operations",
+    "read": "file_operations",
+    "time": "time",
+    "date": "time",
+}
+
+# Named groups and backreferences, which do not survive being combined into one regex
+_GROUP_REFERENCE = re.compile(r"\(\?P[<=]|\(\?<(?![=!])|\\[1-9]|\\g<")
+
 class ToolRegistry:
     """Registry for managing all available tools"""
     
     def __init__(self):
         self.tools: Dict[str, Tool] = {}
         self.compiled_patterns: Dict[str, List[re.Pattern]] = {}
+        self._tool_list_cache: Optional[str] = None
+        # Built lazily; False means the patterns cannot be combined
+        self._dispatch_regex = None
+        self._dispatch_tools: List[str] = []
         self._register_default_tools()
     
     def _register_default_tools(self):
         """Register all default tools"""
-        default_tools = [
-            WeatherTool(),
-            GoogleSearchTool(),
-            MapsTool(),
-            SystemInfoTool(),
-            MathTool(),
-            JokeTool(),
-            FileTool(),
-            TimeTool()
-        ]
-        
-        for tool in default_tools:
-            self.register_tool(tool)
+        for tool_cls in _DEFAULT_TOOLS:
+            self.register_tool(tool_cls())
     
     def register_tool(self, tool: Tool):
         """Register a new tool"""
         self.tools[tool.get_name()] = tool
-        # Compile patterns for faster matching
-        self.compiled_patterns[tool.get_name()] = [
-            re.compile(pattern, re.IGNORECASE) for pattern in tool.get_patterns()
-        ]
+        self._tool_list_cache = None
+        self._dispatch_regex = None
+        # Shared with the tool's own execute(), so each pattern is compiled once
+        self.compiled_patterns[tool.get_name()] = tool.get_compiled_patterns()
     
-    def get_tool_for_command(self, command: str) -> Optional[Tool]:
+    def get_tool_for_command(self, command: str, command_lower: Optional[str] = None) -> Optional[Tool]:
         """Find the appropriate tool for a given command using compiled patterns"""
+        if command_lower is None:
+            command_lower = command.lower()
+        
+        # Fast path: route on the leading verb, as long as that tool really matches
+        words = command_lower.split(maxsplit=1)
+        if words:
+            tool_name = _VERB_TO_TOOL.get(words[0])
+            if tool_name in self.compiled_patterns:
+                for pattern in self.compiled_patterns[tool_name]:
+                    if pattern.search(command_lower):
+                        return self.tools[tool_name]
+        
+        if self._dispatch_regex is None:
+            self._dispatch_regex = self._build_dispatch_regex()
+        if self._dispatch_regex:
+            match = self._dispatch_regex.match(command_lower)
+            if match:
+                return self.tools[self._dispatch_tools[int(match.lastgroup[2:])]]
+            return None
+        
+        # Slow path for patterns that cannot share one regex
         for tool_name, patterns in self.compiled_patterns.items():
             for pattern in patterns:
-                if pattern.search(command):
+                if pattern.search(command_lower):
                     return self.tools[tool_name]
         return None
     
+    def _build_dispatch_regex(self):
+        """Combine every tool pattern into one regex with a positional group per pattern"""
+        # Each branch is anchored at the start and scans forward itself, so the
+        # first tool (in registration order) that matches anywhere still wins.
+        # Group names are _g<k>, with _dispatch_tools[k] naming the tool, so any
+        # tool name is allowed.
+        self._dispatch_tools = []
+        branches = []
+        for name, tool in self.tools.items():
+            for pattern in tool.get_patterns():
+                # Named groups would clash and numbered backreferences would
+                # point at the wrong group once patterns are combined
+                if _GROUP_REFERENCE.search(pattern):
+                    return False
+                branches.append(f"(?s:.*?)(?P<_g{len(self._dispatch_tools)}>{pattern})")
+                self._dispatch_tools.append(name)
+        try:
+            return re.compile("|".join(branches), re.IGNORECASE)
+        except re.error as e:
+            print(f"Warning: falling back to per-pattern tool dispatch: {e}")
+            return False
+    
     def list_tools(self) -> str:
         """List all available tools"""
-        tool_list = "Available tools:\n"
-        for name, tool in self.tools.items():
-            tool_list += f"- {name}: {tool.get_description()}\n"
-        return tool_list
+        # Rebuilt only after a tool is registered
+        if self._tool_list_cache is None:
+            lines = ["Available tools:\n"]
+            lines.extend(f"- {name}: {tool.get_description()}\n" for name, tool in self.tools.items())
+            self._tool_list_cache = "".join(lines)
+        return self._tool_list_cache
+
+# Personal questions and the personal_questions entry that answers each
+_PERSONAL_QUESTIONS = (
+    ("what is your name", "name"),
+    ("what's your name", "name"),
+    ("who are you", "identity"),
+    ("tell me about yourself", "capabilities"),
+    ("what can you do", "capabilities"),
+    ("what are your capabilities", "capabilities"),
+)
 
 class TaskHandler:
     def __init__(self):
-        self.advisory_agent = AIAdvisoryAgent(api_key=config.GROQ_API_KEY)
+        self._advisory_agent = None
+        self._advisory_agent_lock = threading.Lock()
         self.tool_registry = ToolRegistry()
         
+        # Repeated questions that fall through to the advisory agent are
+        # answered from this cache instead of another API round-trip
+        self.response_cache = TTLCache(ttl=300)
+        
         # Load response guidelines from configuration
         self.response_guidelines = yuvan_config.get_response_guidelines()
         self.conversation_flow = yuvan_config.get_conversation_flow()
         
+        # Pick a fresh greeting each time rather than one fixed at startup
+        greet = functools.partial(random.Random().choice, yuvan_config.get_greeting_responses())
+        
         # Simple rule-based responses (fallback before LLM)
         self.simple_responses = {
-            "hello": random.choice(self.response_guidelines["greeting_responses"]),
-            "hi": random.choice(self.response_guidelines["greeting_responses"]),
+            "hello": greet,
+            "hi": greet,
             "help": self.tool_registry.list_tools,
             "tools": self.tool_registry.list_tools,
             "bye": "Goodbye! Have a great day!",
@@ -484,37 +720,60 @@ class TaskHandler:
             "who are you": self.response_guidelines["personal_questions"]["identity"],
             "tell me about yourself": self.response_guidelines["personal_questions"]["capabilities"]
         }
+        
+        # Personal questions are checked before the other simple responses
+        personal = self.response_guidelines["personal_questions"]
+        self._trigger_responses = [
+            (question, personal[category]) for question, category in _PERSONAL_QUESTIONS
+        ]
+        self._trigger_responses.extend(self.simple_responses.items())
+        self._trigger_regex = self._build_trigger_regex(
+            [trigger for trigger, _ in self._trigger_responses]
+        )
+        # Commands that are exactly a trigger ("hi", "help", ...) skip the scan.
+        # Each maps to whatever the scan would have picked for it.
+        self._exact_responses = {
+            trigger: self._match_trigger(trigger) for trigger, _ in self._trigger_responses
+        }
+    
+    @staticmethod
+    def _build_trigger_regex(triggers: List[str]) -> re.Pattern:
+        """Match any trigger phrase in one pass; group N is the Nth trigger"""
+        # Anchored branches keep list order as priority, like the old loops did
+        return re.compile("|".join(f"(?s:.*?)({re.escape(trigger)})" for trigger in triggers))
+    
+    def _match_trigger(self, cmd_lower: str) -> Optional[Any]:
+        """Return the response for the first trigger found in the command"""
+        match = self._trigger_regex.match(cmd_lower)
+        if match:
+            return self._trigger_responses[match.lastindex - 1][1]
+        return None
+    
+    @property
+    def advisory_agent(self):
+        """The LLM fallback, created the first time a command needs it"""
+        with self._advisory_agent_lock:
+            if self._advisory_agent is None:
+                from yuvan.ai_advisory_agent import AIAdvisoryAgent
+                self._advisory_agent = AIAdvisoryAgent(api_key=config.GROQ_API_KEY)
+            return self._advisory_agent
     
     def process_command(self, command: str) -> str:
         """Process a command through the tool system"""
         command = command.strip()
+        cmd_lower = command.lower()
         
-        # Check for personal questions first (before tool matching)
-        personal_questions = [
-            "what is your name", "what's your name", "who are you", 
-            "tell me about yourself", "what can you do", "what are your capabilities"
-        ]
-        
-        for question in personal_questions:
-            if question in command.lower():
-                if "name" in question:
-                    return self.response_guidelines["personal_questions"]["name"]
-                elif "who are you" in question:
-                    return self.response_guidelines["personal_questions"]["identity"]
-                elif "capabilities" in question or "what can you do" in question:
-                    return self.response_guidelines["personal_questions"]["capabilities"]
-                else:
-                    return self.response_guidelines["personal_questions"]["capabilities"]
-        
-        # Check for simple responses
-        for key, response in self.simple_responses.items():
-            if key in command.lower():
-                if callable(response):
-                    return response()
-                return response
+        # Personal questions and simple responses (before tool matching)
+        response = self._exact_responses.get(cmd_lower)
+        if response is None:
+            response = self._match_trigger(cmd_lower)
+        if response is not None:
+            if callable(response):
+                return response()
+            return response
         
         # Try to find and execute a tool
-        tool = self.tool_registry.get_tool_for_command(command)
+        tool = self.tool_registry.get_tool_for_command(command, cmd_lower)
         if tool:
             try:
                 result = tool.execute(command)
@@ -523,4 +782,13 @@ class TaskHandler:
                 return f"Error executing {tool.get_name()}: {str(e)}"
         
         # If no tool matches, pass to the advisory agent
-        return self.advisory_agent.get_response(command) 
\ No newline at end of file
+        cache_key = cmd_lower
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        response = self.advisory_agent.get_response(command)
+        # Error fallbacks are not cached so the next attempt retries the API
+        if response not in self.response_guidelines["error_responses"].values():
+            self.response_cache.set(cache_key, response)
+        return response
@@ -4,13 +4,18 @@ Converts Yuvan's text responses to audio using the provided model
 """
 
 import os
+import re
 import tempfile
-import time
+from concurrent.futures import ThreadPoolExecutor
 from gradio_client import Client
 import pygame
+import queue
 import threading
 from typing import Optional
 
+# Sentence boundaries used to speak long responses piece by piece
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
 class YuvanVoice:
     def __init__(self, hf_token: str = None):
         """
@@ -38,10 +43,16 @@ class YuvanVoice:
         self.fallback_to_text = voice_config["fallback_to_text"]
         
         self.client = None
+        self._template_prompt = None
+        self._default_combined_prompt = None
         self.is_initialized = False
         self.is_speaking = False
-        self.audio_queue = []
+        self.audio_queue = queue.Queue()
         self.audio_thread = None
+        self._stop_stream = threading.Event()
+        self._stop_playback = threading.Event()
+        self._cleanup_queue = queue.Queue()
+        self._cleanup_thread = None
         
         # Initialize pygame mixer for audio playback
         try:
@@ -55,6 +66,8 @@ class YuvanVoice:
         """Initialize the Gradio client"""
         try:
             self.client = Client(self.model_url, hf_token=self.hf_token)
+            self._template_prompt = None
+            self._default_combined_prompt = None
             self.is_initialized = True
             print("✅ Voice system initialized successfully!")
             return True
@@ -78,25 +91,8 @@ class YuvanVoice:
             if not self.initialize_client():
                 return None
         
-        # Use default system prompt if none provided
-        if system_prompt is None:
-            system_prompt = self.system_prompt
-        
         try:
-            # First, apply the template to get the proper system prompt
-            template_result = self.client.predict(
-                template_name=self.template_name,
-                api_name="/apply_template"
-            )
-            
-            # The template result contains [system_prompt, input_text, html, voice_preset, ras_win_len]
-            # We can use the returned system prompt or our custom one
-            if template_result and len(template_result) >= 1:
-                # Use the template's system prompt as base and append our custom prompt
-                template_system_prompt = template_result[0]
-                combined_system_prompt = f"{template_system_prompt}\n\n{system_prompt}"
-            else:
-                combined_system_prompt = system_prompt
+            combined_system_prompt = self._combined_system_prompt(system_prompt)
             
             # Call the generate_speech API
             result = self.client.predict(
@@ -131,6 +127,35 @@ class YuvanVoice:
             print(f"Error in text-to-speech: {e}")
             return None
     
+    def _combined_system_prompt(self, system_prompt: Optional[str]) -> str:
+        """Append the system prompt to the template's, fetching the template once"""
+        if system_prompt is None and self._default_combined_prompt is not None:
+            return self._default_combined_prompt
+        
+        if self._template_prompt is None:
+            # The template is fixed for the session, so /apply_template is only called once
+            template_result = self.client.predict(
+                template_name=self.template_name,
+                api_name="/apply_template"
+            )
+            # The template result contains [system_prompt, input_text, html, voice_preset, ras_win_len]
+            if template_result and len(template_result) >= 1:
+                self._template_prompt = template_result[0]
+            else:
+                self._template_prompt = ""
+        
+        # Use default system prompt if none provided
+        prompt = self.system_prompt if system_prompt is None else system_prompt
+        if self._template_prompt:
+            # Use the template's system prompt as base and append our custom prompt
+            combined = f"{self._template_prompt}\n\n{prompt}"
+        else:
+            combined = prompt
+        
+        if system_prompt is None:
+            self._default_combined_prompt = combined
+        return combined
+    
     def play_audio(self, audio_file_path: str):
         """Play audio file using pygame"""
         if not self.audio_available:
@@ -139,12 +164,12 @@ class YuvanVoice:
         
         try:
             # Load and play the audio
-            pygame.mixer.music.load(audio_file_path)
-            pygame.mixer.music.play()
+            sound = pygame.mixer.Sound(audio_file_path)
+            self._stop_playback.clear()
+            sound.play()
             
-            # Wait for audio to finish
-            while pygame.mixer.music.get_busy():
-                time.sleep(0.1)
+            # Sleep for the clip's length; stop_speaking() wakes us early
+            self._stop_playback.wait(sound.get_length())
                 
         except Exception as e:
             print(f"Error playing audio: {e}")
@@ -162,19 +187,73 @@ class YuvanVoice:
         
         # Generate audio
         audio_file = self.text_to_speech(text, system_prompt)
+        self._play_generated(audio_file, text)
+    
+    def speak_stream(self, text: str, system_prompt: str = None):
+        """
+        Speak longer text sentence by sentence, generating the next
+        sentence while the current one is playing
         
+        Args:
+            text: The text to speak
+            system_prompt: System prompt for the model (uses default if None)
+        """
+        if not text or not text.strip():
+            return
+        
+        sentences = [s for s in _SENTENCE_END.split(text.strip()) if s]
+        if len(sentences) == 1:
+            self.speak(text, system_prompt)
+            return
+        
+        self._stop_stream.clear()
+        # One worker keeps at most one sentence being generated ahead of playback
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pending = pool.submit(self.text_to_speech, sentences[0], system_prompt)
+            for i, sentence in enumerate(sentences):
+                audio_file = pending.result()
+                pending = None
+                if i + 1 < len(sentences) and not self._stop_stream.is_set():
+                    pending = pool.submit(self.text_to_speech, sentences[i + 1], system_prompt)
+                
+                if self._stop_stream.is_set():
+                    self._remove_audio_file(audio_file)
+                    break
+                self._play_generated(audio_file, sentence)
+            
+            if pending is not None:
+                # Stopped while the next sentence was still being generated
+                self._remove_audio_file(pending.result())
+    
+    def _play_generated(self, audio_file: Optional[str], text: str):
+        """Play a generated clip and delete it, or fall back to printing the text"""
         if audio_file:
             # Play the audio
             self.play_audio(audio_file)
-            
-            # Clean up the temporary file
+            self._remove_audio_file(audio_file)
+        elif self.fallback_to_text:
+            # Fallback to text output if voice fails
+            print(f"Yuvan says: {text}")
+    
+    def _remove_audio_file(self, audio_file: Optional[str]):
+        """Queue a generated temporary audio file for deletion off the speech path"""
+        if not audio_file:
+            return
+        if self._cleanup_thread is None or not self._cleanup_thread.is_alive():
+            self._cleanup_thread = threading.Thread(target=self._cleanup_worker, daemon=True)
+            self._cleanup_thread.start()
+        self._cleanup_queue.put(audio_file)
+    
+    def _cleanup_worker(self):
+        """Delete finished audio files until told to stop"""
+        while True:
+            audio_file = self._cleanup_queue.get()
+            if audio_file is None:
+                return
             try:
                 os.remove(audio_file)
             except:
                 pass  # Ignore cleanup errors
-        elif self.fallback_to_text:
-            # Fallback to text output if voice fails
-            print(f"Yuvan says: {text}")
     
     def speak_async(self, text: str, system_prompt: str = None):
         """
@@ -187,25 +266,55 @@ class YuvanVoice:
         if not text or not text.strip():
             return
         
-        # Start audio generation and playback in a separate thread
-        thread = threading.Thread(
-            target=self.speak,
-            args=(text, system_prompt),
-            daemon=True
-        )
-        thread.start()
+        # Hand the text to the single playback worker instead of spawning
+        # a thread per utterance; this also keeps utterances in order
+        if self.audio_thread is None or not self.audio_thread.is_alive():
+            self.audio_thread = threading.Thread(target=self._audio_worker, daemon=True)
+            self.audio_thread.start()
+        self.audio_queue.put((text, system_prompt))
+    
+    def _audio_worker(self):
+        """Speak queued utterances one after another until told to stop"""
+        while True:
+            item = self.audio_queue.get()
+            try:
+                if item is None:
+                    return
+                self.speak_stream(*item)
+            except Exception as e:
+                print(f"Error in audio worker: {e}")
+            finally:
+                self.audio_queue.task_done()
+    
+    def _clear_audio_queue(self):
+        """Discard utterances that have not started playing yet"""
+        while True:
+            try:
+                self.audio_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.audio_queue.task_done()
     
     def stop_speaking(self):
         """Stop any currently playing audio"""
+        self._stop_stream.set()
+        self._clear_audio_queue()
+        self._stop_playback.set()
         if self.audio_available:
             try:
-                pygame.mixer.music.stop()
+                pygame.mixer.stop()
             except:
                 pass
     
     def cleanup(self):
         """Clean up resources"""
         self.stop_speaking()
+        if self.audio_thread is not None and self.audio_thread.is_alive():
+            self.audio_queue.put(None)
+            self.audio_thread = None
+        if self._cleanup_thread is not None and self._cleanup_thread.is_alive():
+            self._cleanup_queue.put(None)
+            self._cleanup_thread = None
         if self.audio_available:
             pygame.mixer.quit()
 
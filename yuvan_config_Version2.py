@@ -3,6 +3,8 @@ Yuvan AI Assistant Configuration
 This file defines Yuvan's character, personality, capabilities, and available tools.
 """
 
+import re
+
 # =============================================================================
 # CHARACTER & PERSONALITY CONFIGURATION
 # =============================================================================
@@ -11,30 +13,30 @@ CHARACTER_CONFIG = {
     "name": "Yuvan",
     "identity": "AI Assistant",
     "accent": "British",
-    "personality_traits": [
+    "personality_traits": (
         "Friendly and approachable",
         "Enthusiastic and helpful",
         "Professional but warm",
         "Knowledgeable about technology",
         "Patient and understanding",
         "Polite and respectful"
-    ],
+    ),
     "speaking_style": {
         "accent": "British English",
-        "expressions": [
+        "expressions": (
             "mate", "brilliant", "absolutely", "right then",
             "quite right", "terribly sorry", "my word"
-        ],
+        ),
         "tone": "Friendly and helpful with a subtle British accent",
         "formality_level": "Casual and approachable"
     },
-    "core_values": [
+    "core_values": (
         "Helpfulness above all",
         "Accuracy in information",
         "Respect for user privacy",
         "Continuous learning",
         "Professional courtesy"
-    ]
+    )
 }
 
 # =============================================================================
@@ -42,33 +44,33 @@ CHARACTER_CONFIG = {
 # =============================================================================
 
 CAPABILITIES = {
-    "general_assistance": [
+    "general_assistance": (
         "Answer questions and provide information",
         "Engage in friendly conversation",
         "Provide explanations and clarifications",
         "Offer suggestions and recommendations",
         "Help with problem-solving"
-    ],
-    "technical_support": [
+    ),
+    "technical_support": (
         "System information and monitoring",
         "File operations assistance",
         "Mathematical calculations",
         "Technical troubleshooting",
         "Software and hardware guidance"
-    ],
-    "information_gathering": [
+    ),
+    "information_gathering": (
         "Web searches for current information",
         "Weather information for any location",
         "Maps and location services",
         "Real-time data retrieval",
         "Fact-checking and verification"
-    ],
-    "entertainment": [
+    ),
+    "entertainment": (
         "Telling jokes and humor",
         "Engaging conversations",
         "Interesting facts and trivia",
         "Light-hearted interactions"
-    ]
+    )
 }
 
 # =============================================================================
@@ -79,151 +81,151 @@ TOOLS_CONFIG = {
     "weather": {
         "name": "Weather Information Tool",
         "description": "Get current weather information for any location worldwide",
-        "capabilities": [
+        "capabilities": (
             "Current temperature and conditions",
             "Humidity and wind information",
             "Forecast data",
             "Location-based weather"
-        ],
-        "usage_examples": [
+        ),
+        "usage_examples": (
             "weather in London",
             "temperature in New York",
             "how's the weather in Tokyo"
-        ],
-        "triggers": [
+        ),
+        "triggers": (
             "weather", "temperature", "forecast", "climate"
-        ]
+        )
     },
     
     "google_search": {
         "name": "Web Search Tool",
         "description": "Search the internet for current information and answers",
-        "capabilities": [
+        "capabilities": (
             "Real-time web searches",
             "Information retrieval",
             "Fact verification",
             "Current events"
-        ],
-        "usage_examples": [
+        ),
+        "usage_examples": (
             "search for latest news",
             "find information about AI",
             "what is machine learning"
-        ],
-        "triggers": [
+        ),
+        "triggers": (
             "search", "find", "what is", "who is", "how to"
-        ]
+        )
     },
     
     "maps": {
         "name": "Maps and Location Tool",
         "description": "Get location information, directions, and nearby places",
-        "capabilities": [
+        "capabilities": (
             "Location search",
             "Directions and navigation",
             "Nearby places (restaurants, hotels, etc.)",
             "Address information"
-        ],
-        "usage_examples": [
+        ),
+        "usage_examples": (
             "directions to Central Park",
             "restaurants near me",
             "where is the nearest gas station"
-        ],
-        "triggers": [
+        ),
+        "triggers": (
             "directions", "where is", "nearby", "restaurants", "hotels"
-        ]
+        )
     },
     
     "system_info": {
         "name": "System Information Tool",
         "description": "Monitor and display system performance and status",
-        "capabilities": [
+        "capabilities": (
             "CPU usage monitoring",
             "RAM usage and memory status",
             "Disk space information",
             "System performance metrics"
-        ],
-        "usage_examples": [
+        ),
+        "usage_examples": (
             "system info",
             "cpu usage",
             "memory status",
             "disk space"
-        ],
-        "triggers": [
+        ),
+        "triggers": (
             "system", "cpu", "ram", "memory", "disk", "computer"
-        ]
+        )
     },
     
     "math": {
         "name": "Mathematical Calculator",
         "description": "Perform mathematical calculations and computations",
-        "capabilities": [
+        "capabilities": (
             "Basic arithmetic operations",
             "Complex mathematical expressions",
             "Scientific calculations",
             "Unit conversions"
-        ],
-        "usage_examples": [
+        ),
+        "usage_examples": (
             "calculate 15 * 23",
             "what is 2^10",
             "solve 3x + 5 = 20"
-        ],
-        "triggers": [
+        ),
+        "triggers": (
             "calculate", "math", "what is", "solve"
-        ]
+        )
     },
     
     "joke": {
         "name": "Joke Teller",
         "description": "Tell jokes and provide entertainment",
-        "capabilities": [
+        "capabilities": (
             "Random joke selection",
             "Clean and appropriate humor",
             "Various joke categories"
-        ],
-        "usage_examples": [
+        ),
+        "usage_examples": (
             "tell me a joke",
             "make me laugh",
             "say something funny"
-        ],
-        "triggers": [
+        ),
+        "triggers": (
             "joke", "funny", "humor", "laugh"
-        ]
+        )
     },
     
     "file_operations": {
         "name": "File Management Tool",
         "description": "List files and read file contents",
-        "capabilities": [
+        "capabilities": (
             "List files in directories",
             "Read file contents",
             "Basic file operations"
-        ],
-        "usage_examples": [
+        ),
+        "usage_examples": (
             "list files in current directory",
             "read file config.py",
             "show files in downloads"
-        ],
-        "triggers": [
+        ),
+        "triggers": (
             "list files", "read file", "show files"
-        ]
+        )
     },
     
     "time": {
         "name": "Time and Date Tool",
         "description": "Provide current time and date information",
-        "capabilities": [
+        "capabilities": (
             "Current time display",
             "Date information",
             "Time zone awareness"
-        ],
-        "usage_examples": [
+        ),
+        "usage_examples": (
             "what time is it",
             "current date",
             "today's date"
-        ],
-        "triggers": [
+        ),
+        "triggers": (
             "time", "date", "current", "today"
-        ]
+        )
     }
 }
 
@@ -232,12 +234,12 @@ TOOLS_CONFIG = {
 # =============================================================================
 
 RESPONSE_GUIDELINES = {
-    "greeting_responses": [
+    "greeting_responses": (
         "Hello! I'm Yuvan, your AI assistant. How can I help you today?",
         "Hi there! I'm Yuvan, ready to assist you with anything you need.",
         "Hello! What can I help you with today?",
         "Hi! I'm Yuvan, your AI assistant. What would you like to know?"
-    ],
+    ),
     
     "personal_questions": {
         "name": "My name is Yuvan! I'm your friendly AI assistant with a British accent.",
@@ -253,19 +255,19 @@ RESPONSE_GUIDELINES = {
         "unknown": "I'm not quite sure how to help with that. Could you try rephrasing your question or ask me about something else?"
     },
     
-    "confirmation_responses": [
+    "confirmation_responses": (
         "Brilliant! I'll get right on that for you.",
         "Great! Let me handle that for you.",
         "Right then, I'll take care of that for you.",
         "Absolutely! I'm on it."
-    ],
+    ),
     
-    "completion_responses": [
+    "completion_responses": (
         "There you go! Is there anything else I can help you with?",
         "Brilliant! That's all sorted. What else can I assist you with?",
         "Great! That's done. Is there anything else you'd like to know?",
         "Perfect! Is there anything else I can help you with?"
-    ]
+    )
 }
 
 # =============================================================================
@@ -275,15 +277,23 @@ RESPONSE_GUIDELINES = {
 CONVERSATION_FLOW = {
     "initial_greeting": "Hello! I'm Yuvan, your AI assistant. How can I help you today?",
     "wake_word_response": "Yes? I'm listening.",
-    "confirmation_phrases": ["brilliant", "great", "absolutely", "right then"],
-    "transition_phrases": ["Now then", "Right", "Well", "So"],
-    "closing_phrases": ["Take care!", "Brilliant!", "Great!", "Perfect!"]
+    "confirmation_phrases": ("brilliant", "great", "absolutely", "right then"),
+    "transition_phrases": ("Now then", "Right", "Well", "So"),
+    "closing_phrases": ("Take care!", "Brilliant!", "Great!", "Perfect!")
 }
 
 # =============================================================================
 # SYSTEM PROMPT TEMPLATE
 # =============================================================================
 
+# Bullet lists for the prompt, each built in a single join
+_CAPABILITY_LINES = "\n".join(
+    f"- {cap}"
+    for category in ("general_assistance", "technical_support", "information_gathering", "entertainment")
+    for cap in CAPABILITIES[category]
+)
+_TOOL_LINES = "\n".join(f"- {tool['name']}: {tool['description']}" for tool in TOOLS_CONFIG.values())
+
 SYSTEM_PROMPT_TEMPLATE = f"""
 You are {CHARACTER_CONFIG['name']}, a friendly and helpful AI assistant with a {CHARACTER_CONFIG['accent']} accent.
 
@@ -298,13 +308,10 @@ BRITISH EXPRESSIONS TO USE (use sparingly and naturally):
 {', '.join(CHARACTER_CONFIG['speaking_style']['expressions'])}
 
 YOUR CAPABILITIES:
-{chr(10).join([f"- {cap}" for cap in CAPABILITIES['general_assistance']])}
-{chr(10).join([f"- {cap}" for cap in CAPABILITIES['technical_support']])}
-{chr(10).join([f"- {cap}" for cap in CAPABILITIES['information_gathering']])}
-{chr(10).join([f"- {cap}" for cap in CAPABILITIES['entertainment']])}
+{_CAPABILITY_LINES}
 
 AVAILABLE TOOLS:
-{chr(10).join([f"- {tool['name']}: {tool['description']}" for tool in TOOLS_CONFIG.values()])}
+{_TOOL_LINES}
 
 RESPONSE GUIDELINES:
 - Be friendly, helpful, and professional
@@ -374,6 +381,13 @@ def get_response_guidelines():
     """Get the response guidelines"""
     return RESPONSE_GUIDELINES
 
+# Bound once so greeting callers skip the dict lookup
+_GREETING_RESPONSES = RESPONSE_GUIDELINES["greeting_responses"]
+
+def get_greeting_responses():
+    """Get the greeting responses as a tuple, ready for random.choice"""
+    return _GREETING_RESPONSES
+
 def get_conversation_flow():
     """Get the conversation flow settings"""
     return CONVERSATION_FLOW
@@ -386,13 +400,47 @@ def get_tool_by_name(tool_name):
     """Get a specific tool configuration by name"""
     return TOOLS_CONFIG.get(tool_name.lower())
 
+def _build_trigger_index():
+    """Map each lowercased trigger to its tools and to their TOOLS_CONFIG keys"""
+    index = {}
+    keys = {}
+    for tool_key, tool_config in TOOLS_CONFIG.items():
+        for trigger in tool_config['triggers']:
+            trigger = trigger.lower()
+            tools = index.setdefault(trigger, [])
+            if tool_config not in tools:
+                tools.append(tool_config)
+            keys.setdefault(trigger, set()).add(tool_key)
+    return index, keys
+
+_TRIGGER_INDEX, _TRIGGER_TOOL_KEYS = _build_trigger_index()
+
+# Every trigger in one alternation, longest first. The lookahead reports a match
+# at each position, so triggers that overlap one another are all seen.
+_TRIGGER_RE = re.compile(
+    r"(?=\b(" + "|".join(map(re.escape, sorted(_TRIGGER_INDEX, key=len, reverse=True))) + r")\b)"
+)
+
+# Only the longest trigger starting at a position is reported, so each trigger
+# also stands for every shorter trigger found inside it
+_TRIGGER_MATCH_KEYS = {
+    trigger: frozenset().union(*(
+        keys for inner, keys in _TRIGGER_TOOL_KEYS.items()
+        if re.search(r"\b" + re.escape(inner) + r"\b", trigger)
+    ))
+    for trigger in _TRIGGER_INDEX
+}
+
 def get_tools_by_trigger(trigger_word):
     """Get tools that match a trigger word"""
-    matching_tools = []
-    for tool_name, tool_config in TOOLS_CONFIG.items():
-        if trigger_word.lower() in [t.lower() for t in tool_config['triggers']]:
-            matching_tools.append(tool_config)
-    return matching_tools
+    return list(_TRIGGER_INDEX.get(trigger_word.lower(), ()))
+
+def find_matching_tools(text):
+    """Get the TOOLS_CONFIG keys of every tool whose triggers appear as whole words, in config order"""
+    found = set()
+    for trigger in _TRIGGER_RE.findall(text.lower()):
+        found |= _TRIGGER_MATCH_KEYS[trigger]
+    return [tool_key for tool_key in TOOLS_CONFIG if tool_key in found]
 
 def get_voice_config():
     """Get the voice system configuration"""
@@ -1,25 +1,20 @@
 import streamlit as st
-import asyncio
-import threading
-import time
 import queue
-import json
-import numpy as np
-from typing import Optional, Dict, Any
-import plotly.graph_objects as go
-import plotly.express as px
-from streamlit_javascript import st_javascript
-import base64
 
 # Import Yuvan components
 from yuvan.task_handler import TaskHandler
-from yuvan.voice_system import speak_text as speak, cleanup_voice
-from yuvan.silero_tts import speak_text_async, cleanup_silero_tts
+from yuvan.voice_system import speak_text as speak
 
 # Import voice animation components
 from voice_animation import VoiceAnimator, create_voice_status_indicator, get_voice_animation_css
 
 class YuvanUI:
+    # Fixed attribute set; one instance lives in session state for the whole session
+    __slots__ = (
+        "task_handler", "is_speaking", "is_thinking", "voice_animator",
+        "speaking_queue", "current_status",
+    )
+    
     def __init__(self):
         self.task_handler = TaskHandler()
         self.is_speaking = False
@@ -69,14 +64,8 @@ def init_session_state():
     if 'yuvan_ui' not in st.session_state:
         st.session_state.yuvan_ui = YuvanUI()
 
-def apply_custom_css():
-    """Apply custom CSS for ChatGPT-like styling"""
-    # Include voice animation CSS
-    voice_css = get_voice_animation_css()
-    
-    st.markdown(voice_css, unsafe_allow_html=True)
-    
-    st.markdown("""
+# ChatGPT-like page styling; built once at import, not on every rerun
+_CUSTOM_CSS = """
     <style>
     /* Main container styling */
     .main {
@@ -90,44 +79,6 @@ def apply_custom_css():
         padding: 20px;
     }
     
-    /* Message styling */
-    .user-message {
-        background: #f7f7f8;
-        padding: 15px 20px;
-        border-radius: 18px;
-        margin: 10px 0;
-        margin-left: 50px;
-        border: 1px solid #e5e5e7;
-        position: relative;
-    }
-    
-    .user-message::before {
-        content: "👤";
-        position: absolute;
-        left: -40px;
-        top: 15px;
-        font-size: 24px;
-    }
-    
-    .assistant-message {
-        background: #ffffff;
-        padding: 15px 20px;
-        border-radius: 18px;
-        margin: 10px 0;
-        margin-right: 50px;
-        border: 1px solid #e5e5e7;
-        box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-        position: relative;
-    }
-    
-    .assistant-message::before {
-        content: "🤖";
-        position: absolute;
-        right: -40px;
-        top: 15px;
-        font-size: 24px;
-    }
-    
     /* Voice animation container */
     .voice-animation {
         display: flex;
@@ -215,53 +166,11 @@ def apply_custom_css():
         opacity: 0.9;
     }
     
-    /* Chat history styling */
-    .chat-history {
-        max-height: 60vh;
-        overflow-y: auto;
-        padding: 20px 0;
-        border-radius: 10px;
-    }
-    
-    .chat-history::-webkit-scrollbar {
-        width: 8px;
-    }
-    
-    .chat-history::-webkit-scrollbar-track {
-        background: rgba(0,0,0,0.1);
-        border-radius: 4px;
-    }
-    
-    .chat-history::-webkit-scrollbar-thumb {
-        background: rgba(16, 163, 127, 0.3);
-        border-radius: 4px;
-    }
-    
-    .chat-history::-webkit-scrollbar-thumb:hover {
-        background: rgba(16, 163, 127, 0.5);
-    }
-    
     /* Sidebar styling */
     .css-1d391kg {
         background-color: #f8f9fa;
     }
     
-    /* Animation for new messages */
-    @keyframes slideIn {
-        from {
-            opacity: 0;
-            transform: translateY(20px);
-        }
-        to {
-            opacity: 1;
-            transform: translateY(0);
-        }
-    }
-    
-    .user-message, .assistant-message {
-        animation: slideIn 0.3s ease-out;
-    }
-    
     /* Hide Streamlit branding */
     #MainMenu {visibility: hidden;}
     footer {visibility: hidden;}
@@ -272,35 +181,16 @@ def apply_custom_css():
         .chat-container {
             padding: 10px;
         }
-        
-        .user-message, .assistant-message {
-            margin-left: 0;
-            margin-right: 0;
-        }
-        
-        .user-message::before, .assistant-message::before {
-            display: none;
-        }
     }
     </style>
-    """, unsafe_allow_html=True)
+    """
 
-def display_message(role: str, content: str):
-    """Display a message with appropriate styling"""
-    if role == "user":
-        st.markdown(f"""
-        <div class="user-message">
-            <strong>You:</strong><br>
-            {content}
-        </div>
-        """, unsafe_allow_html=True)
-    else:
-        st.markdown(f"""
-        <div class="assistant-message">
-            <strong>🤖 Yuvan:</strong><br>
-            {content}
-        </div>
-        """, unsafe_allow_html=True)
+# Voice animation CSS followed by the page styling, sent as one block
+_COMBINED_CSS_HTML = get_voice_animation_css() + _CUSTOM_CSS
+
+def apply_custom_css():
+    """Apply custom CSS for ChatGPT-like styling"""
+    st.markdown(_COMBINED_CSS_HTML, unsafe_allow_html=True)
 
 def main():
     """Main Streamlit app"""
@@ -351,17 +241,16 @@ def main():
         chat_container = st.container()
         
         with chat_container:
-            st.markdown('<div class="chat-history">', unsafe_allow_html=True)
             for message in st.session_state.messages:
-                display_message(message["role"], message["content"])
-            st.markdown('</div>', unsafe_allow_html=True)
+                with st.chat_message(message["role"]):
+                    st.markdown(message["content"])
         
         # Input area
         st.markdown("---")
         col1, col2 = st.columns([4, 1])
         
         with col1:
-            user_input = st.text_input(
+            st.text_input(
                 "Type your message...",
                 key="user_input",
                 placeholder="Ask Yuvan anything...",
@@ -369,17 +258,14 @@ def main():
             )
         
         with col2:
-            send_button = st.button("Send 📤", key="send_button", use_container_width=True)
+            # Handled in the click callback, before this run renders the chat
+            st.button("Send 📤", key="send_button", use_container_width=True, on_click=on_send)
         
         # Voice input button
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
             voice_button = st.button("🎤 Voice Input", key="voice_button", use_container_width=True)
         
-        # Process input
-        if send_button and user_input:
-            process_user_input(user_input)
-        
         if voice_button:
             st.info("🎤 Voice input feature coming soon! For now, please type your message.")
         
@@ -389,11 +275,7 @@ def main():
     with st.sidebar:
         st.markdown("### 🎛️ Controls")
         
-        if st.button("🗑️ Clear Chat", use_container_width=True):
-            st.session_state.messages = [
-                {"role": "assistant", "content": "Hello! I'm Yuvan, your AI assistant. How can I help you today?"}
-            ]
-            st.rerun()
+        st.button("🗑️ Clear Chat", use_container_width=True, on_click=clear_chat)
         
         st.markdown("### ℹ️ About Yuvan")
         st.markdown("""
@@ -409,6 +291,18 @@ def main():
         st.checkbox("Enable voice output", value=True, key="voice_enabled")
         st.selectbox("Voice speed", ["Slow", "Normal", "Fast"], index=1, key="voice_speed")
 
+def on_send():
+    """Send button callback: process whatever is in the input box"""
+    user_input = st.session_state.get("user_input", "")
+    if user_input:
+        process_user_input(user_input)
+
+def clear_chat():
+    """Clear Chat button callback"""
+    st.session_state.messages = [
+        {"role": "assistant", "content": "Hello! I'm Yuvan, your AI assistant. How can I help you today?"}
+    ]
+
 def process_user_input(user_input: str):
     """Process user input and generate response"""
     # Add user message to chat
@@ -427,21 +321,18 @@ def process_user_input(user_input: str):
     
     # If voice is enabled, speak the response
     if st.session_state.get("voice_enabled", True):
-        # Start speaking in a separate thread
-        def speak_response():
-            try:
-                st.session_state.yuvan_ui.speak_with_animation(response)
-            except Exception as e:
-                print(f"Voice synthesis error: {e}")
-                st.session_state.yuvan_ui.set_status("idle")
-        
-        threading.Thread(target=speak_response, daemon=True).start()
+        # speak() only queues the text on the voice system's own worker, so
+        # this returns immediately
+        try:
+            st.session_state.yuvan_ui.speak_with_animation(response)
+        except Exception as e:
+            print(f"Voice synthesis error: {e}")
+            st.session_state.yuvan_ui.set_status("idle")
     else:
         st.session_state.yuvan_ui.set_status("idle")
     
-    # Clear input and rerun
+    # Clear input; the rerun that follows the callback shows the new messages
     st.session_state.user_input = ""
-    st.rerun()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file